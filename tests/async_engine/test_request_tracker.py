@@ -80,3 +80,43 @@ def test_request_tracker():
     assert new[0]["request_id"] == "5"
     assert stream_2.finished
     assert not stream_5.finished
+
+
+def test_request_tracker_sets_event_once_per_drain():
+    tracker = RequestTracker()
+    tracker.new_requests_event = DummyEvent()
+    num_sets = 0
+    original_set = tracker.new_requests_event.set
+
+    def counting_set():
+        nonlocal num_sets
+        num_sets += 1
+        original_set()
+
+    tracker.new_requests_event.set = counting_set
+    tracker.add_request("1")
+    tracker.add_request("2")
+    tracker.add_request("3")
+    assert tracker.new_requests_event.flag
+    assert num_sets == 1
+    new, _ = tracker.get_new_and_finished_requests()
+    assert len(new) == 3
+    assert not tracker.new_requests_event.flag
+
+    tracker.add_request("4")
+    assert tracker.new_requests_event.flag
+    assert num_sets == 2
+
+
+def test_request_tracker_abort_before_readd():
+    tracker = RequestTracker()
+    tracker.new_requests_event = DummyEvent()
+    stream_1 = tracker.add_request("1")
+    tracker.abort_request("1")
+    stream_2 = tracker.add_request("1")
+    new, finished = tracker.get_new_and_finished_requests()
+    assert not new
+    assert finished == {"1"}
+    assert stream_1.finished
+    assert stream_2.finished
+    assert "1" not in tracker
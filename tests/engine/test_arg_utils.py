@@ -0,0 +1,61 @@
+import argparse
+import dataclasses
+
+import pytest
+
+from vllm.engine.arg_utils import AsyncEngineArgs, EngineArgs
+
+
+def test_load_config_from_s3_path():
+    engine_args = EngineArgs(model="facebook/opt-125m",
+                             load_s3_path="s3://bucket/path/to/model",
+                             load_s3_region="us-east-1")
+    load_config = engine_args._build_load_config()
+    assert load_config.s3_bucket == "bucket"
+    assert load_config.s3_prefix == "path/to/model"
+    assert load_config.region == "us-east-1"
+
+
+def test_no_load_config_without_s3_path():
+    engine_args = EngineArgs(model="facebook/opt-125m")
+    assert engine_args._build_load_config() is None
+
+
+@pytest.mark.parametrize(
+    "load_s3_path", ["bucket/key", "s3://bucket", "s3://bucket/", "s3:///key"])
+def test_malformed_s3_path(load_s3_path: str):
+    engine_args = EngineArgs(model="facebook/opt-125m",
+                             load_s3_path=load_s3_path)
+    with pytest.raises(ValueError):
+        engine_args._build_load_config()
+
+
+def test_lora_dtype_from_cli_args():
+    parser = EngineArgs.add_cli_args(argparse.ArgumentParser())
+    args = parser.parse_args(
+        ["--model", "facebook/opt-125m", "--lora-dtype", "float16"])
+    engine_args = EngineArgs.from_cli_args(args)
+    assert engine_args.lora_dtype == "float16"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        engine_args.lora_dtype = "auto"
+
+
+@pytest.mark.parametrize("engine_args_cls", [EngineArgs, AsyncEngineArgs])
+def test_parse_cli_matches_from_cli_args(engine_args_cls):
+    argv = ["--model", "facebook/opt-125m", "--max-num-seqs", "8"]
+    if engine_args_cls is AsyncEngineArgs:
+        argv += [
+            "--engine-use-ray", "--disable-log-requests", "--max-log-len",
+            "100"
+        ]
+    parser = engine_args_cls.add_cli_args(argparse.ArgumentParser())
+    expected = engine_args_cls.from_cli_args(parser.parse_args(argv))
+    assert engine_args_cls.parse_cli(argv) == expected
+    if engine_args_cls is AsyncEngineArgs:
+        assert expected.engine_use_ray
+        assert expected.disable_log_requests
+        assert expected.max_log_len == 100
+    # A second call reuses the parser built by the first.
+    parser = engine_args_cls._cli_parser()
+    assert engine_args_cls.parse_cli(argv) == expected
+    assert engine_args_cls._cli_parser() is parser
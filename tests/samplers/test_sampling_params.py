@@ -0,0 +1,74 @@
+import copy
+
+import msgspec
+import pytest
+
+from vllm.sampling_params import SamplingParams
+
+
+@pytest.mark.parametrize("stop, expected", [
+    (None, ()),
+    ("stop", ("stop", )),
+    (["a", "b"], ("a", "b")),
+    (("a", "b"), ("a", "b")),
+])
+def test_stop_is_normalized_to_tuple(stop, expected):
+    sampling_params = SamplingParams(stop=stop)
+    assert sampling_params.stop == expected
+
+
+@pytest.mark.parametrize("stop_token_ids, expected", [
+    (None, ()),
+    ([1, 2], (1, 2)),
+    ((1, 2), (1, 2)),
+])
+def test_stop_token_ids_is_normalized_to_tuple(stop_token_ids, expected):
+    sampling_params = SamplingParams(stop_token_ids=stop_token_ids)
+    assert sampling_params.stop_token_ids == expected
+
+
+def test_stop_defaults_are_empty_tuples():
+    assert SamplingParams().stop == ()
+    assert SamplingParams().stop_token_ids == ()
+
+
+def test_msgpack_round_trip():
+    sampling_params = SamplingParams(temperature=0.0,
+                                     stop=["a", "b"],
+                                     stop_token_ids=[1, 2])
+    decoded = msgspec.msgpack.decode(msgspec.msgpack.encode(sampling_params),
+                                     type=SamplingParams)
+    assert decoded == sampling_params
+    assert decoded.stop == ("a", "b")
+    assert decoded.stop_token_ids == (1, 2)
+    assert decoded.sampling_type == sampling_params.sampling_type
+    assert decoded.actual_best_of == sampling_params.actual_best_of
+
+
+@pytest.mark.parametrize("copy_fn", [copy.copy, copy.deepcopy])
+def test_copy_keeps_derived_values(copy_fn):
+    sampling_params = SamplingParams(n=2,
+                                     temperature=0.7,
+                                     presence_penalty=0.5)
+    copied = copy_fn(sampling_params)
+    assert copied == sampling_params
+    assert copied.sampling_type == sampling_params.sampling_type
+    assert copied.has_penalties
+    assert copied.actual_best_of == 2
+
+
+@pytest.mark.parametrize("best_of", [None, 0])
+def test_unset_best_of_defaults_to_n(best_of):
+    assert SamplingParams(n=3, best_of=best_of).actual_best_of == 3
+
+
+def test_negative_best_of_is_rejected():
+    with pytest.raises(ValueError, match="best_of must be greater than"):
+        SamplingParams(n=2, best_of=-1)
+
+
+def test_hash_matches_equality():
+    assert hash(SamplingParams(n=2, stop="a")) == hash(
+        SamplingParams(n=2, stop=["a"]))
+    with pytest.raises(TypeError):
+        hash(SamplingParams(logits_processors=[]))
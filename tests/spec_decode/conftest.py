@@ -1,10 +1,51 @@
+import json
 
 import pytest
-from typing import Generator, Optional
+import ray
+from typing import Generator, Optional, Tuple
 
 from vllm import LLM
 from tests.anyscale.utils import SecretManager, cleanup
 
+# Fixtures that build their LLM through _get_or_create_llm.
+_CACHED_LLM_FIXTURES = frozenset([
+    "spec_decode_llm",
+    "spec_decode_llm_generator",
+    "max_model_len_spec_decode_generator",
+    "non_spec_decode_llm_generator",
+    "max_model_len_llm_generator",
+])
+
+# The most recently built LLM, keyed by its constructor kwargs. Consecutive
+# tests asking for an identical LLM reuse it instead of reloading the weights
+# and re-reserving the KV cache. Only one LLM is kept alive at a time since
+# each one reserves most of the GPU memory.
+_cached_llm: Optional[Tuple[str, LLM]] = None
+
+
+def _get_or_create_llm(**kwargs) -> LLM:
+    global _cached_llm
+    key = json.dumps(kwargs, sort_keys=True, default=str)
+    if _cached_llm is not None:
+        cached_key, llm = _cached_llm
+        # Tests that call cleanup() shut down the Ray workers of the cached
+        # LLM, in which case it cannot be reused.
+        if cached_key == key and ray.is_initialized():
+            return llm
+        del llm
+        _release_cached_llm()
+    llm = LLM(**kwargs)
+    _cached_llm = (key, llm)
+    return llm
+
+
+def _release_cached_llm() -> None:
+    global _cached_llm
+    if _cached_llm is None:
+        return
+    _cached_llm = None
+    cleanup()
+
 
 @pytest.fixture(scope="session", autouse=True)
 def load_secrets():
@@ -12,6 +53,19 @@ def load_secrets():
     secrets.override_secret("HUGGING_FACE_HUB_TOKEN")
 
 
+@pytest.fixture(autouse=True)
+def release_cached_llm_if_unused(request):
+    """Free the cached LLM before tests that build their own."""
+    if _CACHED_LLM_FIXTURES.isdisjoint(request.fixturenames):
+        _release_cached_llm()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def release_cached_llm():
+    yield
+    _release_cached_llm()
+
+
 # pylint: disable=redefined-outer-name
 @pytest.fixture(name="spec_decode_llm")
 def create_spec_decode_llm(
@@ -67,7 +121,7 @@ def create_spec_decode_llm_generator(
         if max_model_len is not None:
             addl_kwargs["max_model_len"] = max_model_len
 
-        spec_decode_llm = LLM(
+        yield _get_or_create_llm(
             model=target_model,
             speculative_model=draft_model,
             num_speculative_tokens=num_speculative_tokens,
@@ -79,11 +133,6 @@ def create_spec_decode_llm_generator(
             **addl_kwargs,
         )
 
-        yield spec_decode_llm
-
-        del spec_decode_llm
-        cleanup()
-
     return generator()
 
 
@@ -117,7 +166,7 @@ def create_non_spec_decode_llm_generator(
         if max_model_len is not None:
             addl_kwargs["max_model_len"] = max_model_len
 
-        llm = LLM(
+        yield _get_or_create_llm(
             model=target_model,
             tensor_parallel_size=tensor_parallel_size,
             enable_cuda_graph=with_cuda_graph,
@@ -125,9 +174,4 @@ def create_non_spec_decode_llm_generator(
             **addl_kwargs,
         )
 
-        yield llm
-
-        del llm
-        cleanup()
-
     return generator()
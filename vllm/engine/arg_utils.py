@@ -1,15 +1,18 @@
 import argparse
 import dataclasses
+import functools
 import json
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from vllm.config import (CacheConfig, ModelConfig, ParallelConfig,
                          SchedulerConfig, LoadConfig, SpeculativeConfig,
                          LoRAConfig)
 
+_ArgSpec = Tuple[Tuple[Tuple[str, ...], Dict[str, Any]], ...]
 
-@dataclass
+
+@dataclass(frozen=True)
 class EngineArgs:
     """Arguments for vLLM engine."""
     model: str
@@ -33,7 +36,7 @@ class EngineArgs:
     revision: Optional[str] = None
     tokenizer_revision: Optional[str] = None
     quantization: Optional[str] = None
-    load_s3_path: str = None
+    load_s3_path: Optional[str] = None
     load_s3_region: str = 'us-west-2'
     enable_cuda_graph: bool = False
     cuda_graph_max_context_len: int = 5000
@@ -49,7 +52,7 @@ class EngineArgs:
     max_loras: int = 1
     max_lora_rank: int = 16
     lora_extra_vocab_size: int = 256
-    lora_dtype = 'auto'
+    lora_dtype: str = 'auto'
     max_cpu_loras: int = -1
     flash_style: bool = False
     max_chunked_prefill_len: int = -1
@@ -59,270 +62,38 @@ class EngineArgs:
 
     def __post_init__(self):
         if self.tokenizer is None:
-            self.tokenizer = self.model
+            object.__setattr__(self, 'tokenizer', self.model)
 
     @staticmethod
     def add_cli_args(
             parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
         """Shared CLI arguments for vLLM engine."""
+        return _add_cli_args(parser, _ENGINE_ARGS_SPEC)
 
-        # NOTE: If you update any of the arguments below, please also
-        # make sure to update docs/source/models/engine_args.rst
-
-        # Model arguments
-        parser.add_argument(
-            '--model',
-            type=str,
-            default='facebook/opt-125m',
-            help='name or path of the huggingface model to use')
-        parser.add_argument(
-            '--tokenizer',
-            type=str,
-            default=EngineArgs.tokenizer,
-            help='name or path of the huggingface tokenizer to use')
-        parser.add_argument(
-            '--revision',
-            type=str,
-            default=None,
-            help='the specific model version to use. It can be a branch '
-            'name, a tag name, or a commit id. If unspecified, will use '
-            'the default version.')
-        parser.add_argument(
-            '--tokenizer-revision',
-            type=str,
-            default=None,
-            help='the specific tokenizer version to use. It can be a branch '
-            'name, a tag name, or a commit id. If unspecified, will use '
-            'the default version.')
-        parser.add_argument('--tokenizer-mode',
-                            type=str,
-                            default=EngineArgs.tokenizer_mode,
-                            choices=['auto', 'slow'],
-                            help='tokenizer mode. "auto" will use the fast '
-                            'tokenizer if available, and "slow" will '
-                            'always use the slow tokenizer.')
-        parser.add_argument('--trust-remote-code',
-                            action='store_true',
-                            help='trust remote code from huggingface')
-        parser.add_argument('--download-dir',
-                            type=str,
-                            default=EngineArgs.download_dir,
-                            help='directory to download and load the weights, '
-                            'default to the default cache dir of '
-                            'huggingface')
-
-        # LoRA related configs
-        parser.add_argument('--enable-lora',
-                            action='store_true',
-                            help='enable lora adapters')
-        parser.add_argument('--max-loras',
-                            type=int,
-                            default=EngineArgs.max_loras,
-                            help='max number of LoRAs in a single batch')
-        parser.add_argument('--max-lora-rank',
-                            type=int,
-                            default=EngineArgs.max_lora_rank,
-                            help='max LoRA rank')
-        parser.add_argument('--lora-extra-vocab-size',
-                            type=int,
-                            default=EngineArgs.lora_extra_vocab_size,
-                            help='LoRA extra vocab size')
-        parser.add_argument('--lora-dtype',
-                            type=str,
-                            default=EngineArgs.lora_dtype,
-                            choices=['auto', 'float16', 'bfloat16', 'float32'],
-                            help='data type for lora')
-        parser.add_argument(
-            '--max-cpu-loras',
-            type=int,
-            default=EngineArgs.max_cpu_loras,
-            help=('Maximum number of loras to store in CPU memory. '
-                  'Must be >= than max_num_seqs. '
-                  'Defaults to max_num_seqs.'))
-        # Cuda Graph related configs
-        parser.add_argument('--enable-cuda-graph',
-                            action='store_true',
-                            help='enable cuda graph for decoding')
-        parser.add_argument('--cuda-graph-max-context-len',
-                            type=int,
-                            default=5000,
-                            help='max context length for cuda graph decoding.'
-                            'request with longer context will fallback to'
-                            'non-compiled decoding')
-        parser.add_argument('--cuda-graph-cache-size',
-                            type=int,
-                            default=10,
-                            help='num of cached cuda graphs for decoding')
-        parser.add_argument(
-            '--disable-shared-memory',
-            action='store_true',
-            help='don\'t use shared memory for engine<->worker comms')
-        parser.add_argument(
-            '--num-tokenizer-actors',
-            type=int,
-            default=0,
-            help='num of Ray actors for tokenization (0 is no Ray)')
-        parser.add_argument(
-            '--load-format',
-            type=str,
-            default=EngineArgs.load_format,
-            choices=['auto', 'pt', 'safetensors', 'npcache', 'dummy'],
-            help='The format of the model weights to load. '
-            '"auto" will try to load the weights in the safetensors format '
-            'and fall back to the pytorch bin format if safetensors format '
-            'is not available. '
-            '"pt" will load the weights in the pytorch bin format. '
-            '"safetensors" will load the weights in the safetensors format. '
-            '"npcache" will load the weights in pytorch format and store '
-            'a numpy cache to speed up the loading. '
-            '"dummy" will initialize the weights with random values, '
-            'which is mainly for profiling.')
-        parser.add_argument(
-            '--dtype',
-            type=str,
-            default=EngineArgs.dtype,
-            choices=[
-                'auto', 'half', 'float16', 'bfloat16', 'float', 'float32'
-            ],
-            help='data type for model weights and activations. '
-            'The "auto" option will use FP16 precision '
-            'for FP32 and FP16 models, and BF16 precision '
-            'for BF16 models.')
-        parser.add_argument('--max-model-len',
-                            type=int,
-                            default=None,
-                            help='model context length. If unspecified, '
-                            'will be automatically derived from the model.')
-        # Parallel arguments
-        parser.add_argument('--worker-use-ray',
-                            action='store_true',
-                            help='use Ray for distributed serving, will be '
-                            'automatically set when using more than 1 GPU')
-        parser.add_argument('--pipeline-parallel-size',
-                            '-pp',
-                            type=int,
-                            default=EngineArgs.pipeline_parallel_size,
-                            help='number of pipeline stages')
-        parser.add_argument('--tensor-parallel-size',
-                            '-tp',
-                            type=int,
-                            default=EngineArgs.tensor_parallel_size,
-                            help='number of tensor parallel replicas')
-        # KV cache arguments
-        parser.add_argument('--block-size',
-                            type=int,
-                            default=EngineArgs.block_size,
-                            choices=[8, 16, 32, 64, 128, 256, 512, 1024],
-                            help='token block size')
-        # TODO(woosuk): Support fine-grained seeds (e.g., seed per request).
-        parser.add_argument('--seed',
-                            type=int,
-                            default=EngineArgs.seed,
-                            help='random seed')
-        parser.add_argument('--swap-space',
-                            type=int,
-                            default=EngineArgs.swap_space,
-                            help='CPU swap space size (GiB) per GPU')
-        parser.add_argument('--gpu-memory-utilization',
-                            type=float,
-                            default=EngineArgs.gpu_memory_utilization,
-                            help='the percentage of GPU memory to be used for'
-                            'the model executor')
-        parser.add_argument('--max-num-batched-tokens',
-                            type=int,
-                            default=EngineArgs.max_num_batched_tokens,
-                            help='maximum number of batched tokens per '
-                            'iteration')
-        parser.add_argument('--max-num-seqs',
-                            type=int,
-                            default=EngineArgs.max_num_seqs,
-                            help='maximum number of sequences per iteration')
-        parser.add_argument('--disable-log-stats',
-                            action='store_true',
-                            help='disable logging statistics')
-        # Quantization settings.
-        parser.add_argument('--quantization',
-                            '-q',
-                            type=str,
-                            choices=['awq', 'squeezellm', None],
-                            default=None,
-                            help='Method used to quantize the weights')
-        parser.add_argument('--load-s3-path',
-                            type=str,
-                            default=None,
-                            help='Fast loading s3 path')
-        parser.add_argument('--load-s3-region',
-                            type=str,
-                            default='us-west-2',
-                            help='Fast loading s3 region')
-        parser.add_argument('--rope-scaling',
-                            default=None,
-                            type=json.loads,
-                            help='RoPE scaling configuration')
-        parser.add_argument(
-            '--speculative-model',
-            type=str,
-            default=None,
-            help='name of the draft model to be used in speculative decoding.')
-
-        parser.add_argument(
-            '--speculative-model-uses-tp-1',
-            action='store_true',
-            help='whether the speculative model should use the same tensor '
-            'parallel degree as the verifier model, or use tp=1')
-
-        parser.add_argument('--num-speculative-tokens',
-                            type=int,
-                            default=None,
-                            help='number of speculative tokens to sample from '
-                            'the draft model in speculative decoding')
-
-        parser.add_argument('--target-model-input-padding-size',
-                            type=int,
-                            default=None,
-                            help='padding size for speculative decoding target'
-                            ' model prompt/generation tokens.'
-                            ' must be a multiple of 8')
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _cli_attrs(cls) -> Tuple[str, ...]:
+        """Names of the dataclass fields, computed once per class."""
+        return tuple(attr.name for attr in dataclasses.fields(cls))
 
-        parser.add_argument('--draft-model-input-padding-size',
-                            type=int,
-                            default=None,
-                            help='padding size for speculative decoding draft'
-                            ' model prompt/generation tokens.'
-                            ' must be a multiple of 8')
+    @classmethod
+    def from_cli_args(cls, args: argparse.Namespace) -> 'EngineArgs':
+        # Set the attributes of this dataclass from the parsed arguments.
+        return cls(**{attr: getattr(args, attr) for attr in cls._cli_attrs()})
 
-        parser.add_argument('--flash-style',
-                            action='store_true',
-                            help='use flash attention')
-        parser.add_argument(
-            '--max-chunked-prefill-len',
-            type=int,
-            default=-1,
-            help='max number of prefill tokens allowed in chunked prefill'
-            ', -1 means no limit')
-        parser.add_argument(
-            '--max-num-prompt-seqs',
-            type=int,
-            default=1024,
-            help='max number of prompt sequences allowed in prefill')
-        parser.add_argument('--input-padding-size',
-                            type=int,
-                            default=8,
-                            help='padding size for prompt/generation tokens.'
-                            ' must be a multiple of 8')
-        parser.add_argument('--ray-workers-use-nsight',
-                            type=bool,
-                            default=False,
-                            help='use nsight to profile ray workers')
-        return parser
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _cli_parser(cls) -> argparse.ArgumentParser:
+        """Parser with only the engine arguments, built once per class."""
+        parser = argparse.ArgumentParser(description=cls.__doc__)
+        return cls.add_cli_args(parser)
 
     @classmethod
-    def from_cli_args(cls, args: argparse.Namespace) -> 'EngineArgs':
-        # Get the list of attributes of this dataclass.
-        attrs = [attr.name for attr in dataclasses.fields(cls)]
-        # Set the attributes from the parsed arguments.
-        engine_args = cls(**{attr: getattr(args, attr) for attr in attrs})
-        return engine_args
+    def parse_cli(cls, argv: Optional[List[str]] = None) -> 'EngineArgs':
+        """Parse engine arguments from the command line (`sys.argv` if
+        `argv` is None). Callers that add their own options should build a
+        parser with `add_cli_args` and use `from_cli_args` instead."""
+        return cls.from_cli_args(cls._cli_parser().parse_args(argv))
 
     def create_engine_configs(
         self,
@@ -375,26 +146,259 @@ class EngineArgs:
             flash_style=self.flash_style,
             input_padding_size=self.input_padding_size,
         )
-        if self.load_s3_path is not None:
-            if self.load_s3_path.startswith('s3://'):
-                _, _, bucket, key = self.load_s3_path.split('/', 3)
-            load_config = LoadConfig(bucket, key, self.load_s3_region)
-        else:
-            load_config = None
-
-        lora_config = LoRAConfig(
-            max_lora_rank=self.max_lora_rank,
-            max_loras=self.max_loras,
-            lora_extra_vocab_size=self.lora_extra_vocab_size,
-            lora_dtype=self.lora_dtype,
-            max_cpu_loras=self.max_cpu_loras
-            if self.max_cpu_loras > 0 else None) if self.enable_lora else None
+        load_config = self._build_load_config()
+        lora_config = self._build_lora_config()
 
         return (model_config, cache_config, parallel_config, scheduler_config,
                 load_config, speculative_config, lora_config)
 
+    def _build_load_config(self) -> Optional[LoadConfig]:
+        if self.load_s3_path is None:
+            return None
+        if not self.load_s3_path.startswith('s3://'):
+            raise ValueError("load_s3_path must start with 's3://', got "
+                             f"{self.load_s3_path!r}.")
+        bucket, _, key = self.load_s3_path[len('s3://'):].partition('/')
+        if not bucket or not key:
+            raise ValueError("load_s3_path must be of the form "
+                             "'s3://<bucket>/<key>', got "
+                             f"{self.load_s3_path!r}.")
+        return LoadConfig(bucket, key, self.load_s3_region)
+
+    def _build_lora_config(self) -> Optional[LoRAConfig]:
+        if not self.enable_lora:
+            return None
+        return LoRAConfig(max_lora_rank=self.max_lora_rank,
+                          max_loras=self.max_loras,
+                          lora_extra_vocab_size=self.lora_extra_vocab_size,
+                          lora_dtype=self.lora_dtype,
+                          max_cpu_loras=self.max_cpu_loras
+                          if self.max_cpu_loras > 0 else None)
+
+
+# CLI arguments as (flags, kwargs) records for `parser.add_argument`. The
+# records are built once at import time rather than on every parser build.
+# NOTE: If you update any of the arguments below, please also
+# make sure to update docs/source/models/engine_args.rst
+_ENGINE_ARGS_SPEC: _ArgSpec = (
+    # Model arguments
+    (('--model', ),
+     dict(type=str,
+          default='facebook/opt-125m',
+          help='name or path of the huggingface model to use')),
+    (('--tokenizer', ),
+     dict(type=str,
+          default=EngineArgs.tokenizer,
+          help='name or path of the huggingface tokenizer to use')),
+    (('--revision', ),
+     dict(type=str,
+          default=None,
+          help='the specific model version to use. It can be a branch '
+          'name, a tag name, or a commit id. If unspecified, will use '
+          'the default version.')),
+    (('--tokenizer-revision', ),
+     dict(type=str,
+          default=None,
+          help='the specific tokenizer version to use. It can be a branch '
+          'name, a tag name, or a commit id. If unspecified, will use '
+          'the default version.')),
+    (('--tokenizer-mode', ),
+     dict(type=str,
+          default=EngineArgs.tokenizer_mode,
+          choices=['auto', 'slow'],
+          help='tokenizer mode. "auto" will use the fast '
+          'tokenizer if available, and "slow" will '
+          'always use the slow tokenizer.')),
+    (('--trust-remote-code', ),
+     dict(action='store_true', help='trust remote code from huggingface')),
+    (('--download-dir', ),
+     dict(type=str,
+          default=EngineArgs.download_dir,
+          help='directory to download and load the weights, '
+          'default to the default cache dir of '
+          'huggingface')),
+    # LoRA related configs
+    (('--enable-lora', ), dict(action='store_true',
+                               help='enable lora adapters')),
+    (('--max-loras', ),
+     dict(type=int,
+          default=EngineArgs.max_loras,
+          help='max number of LoRAs in a single batch')),
+    (('--max-lora-rank', ),
+     dict(type=int, default=EngineArgs.max_lora_rank, help='max LoRA rank')),
+    (('--lora-extra-vocab-size', ),
+     dict(type=int,
+          default=EngineArgs.lora_extra_vocab_size,
+          help='LoRA extra vocab size')),
+    (('--lora-dtype', ),
+     dict(type=str,
+          default=EngineArgs.lora_dtype,
+          choices=['auto', 'float16', 'bfloat16', 'float32'],
+          help='data type for lora')),
+    (('--max-cpu-loras', ),
+     dict(type=int,
+          default=EngineArgs.max_cpu_loras,
+          help='Maximum number of loras to store in CPU memory. '
+          'Must be >= than max_num_seqs. '
+          'Defaults to max_num_seqs.')),
+    # Cuda Graph related configs
+    (('--enable-cuda-graph', ),
+     dict(action='store_true', help='enable cuda graph for decoding')),
+    (('--cuda-graph-max-context-len', ),
+     dict(type=int,
+          default=5000,
+          help='max context length for cuda graph decoding.'
+          'request with longer context will fallback to'
+          'non-compiled decoding')),
+    (('--cuda-graph-cache-size', ),
+     dict(type=int, default=10,
+          help='num of cached cuda graphs for decoding')),
+    (('--disable-shared-memory', ),
+     dict(action='store_true',
+          help='don\'t use shared memory for engine<->worker comms')),
+    (('--num-tokenizer-actors', ),
+     dict(type=int,
+          default=0,
+          help='num of Ray actors for tokenization (0 is no Ray)')),
+    (('--load-format', ),
+     dict(type=str,
+          default=EngineArgs.load_format,
+          choices=['auto', 'pt', 'safetensors', 'npcache', 'dummy'],
+          help='The format of the model weights to load. '
+          '"auto" will try to load the weights in the safetensors '
+          'format and fall back to the pytorch bin format if '
+          'safetensors format is not available. '
+          '"pt" will load the weights in the pytorch bin format. '
+          '"safetensors" will load the weights in the safetensors '
+          'format. '
+          '"npcache" will load the weights in pytorch format and store '
+          'a numpy cache to speed up the loading. '
+          '"dummy" will initialize the weights with random values, '
+          'which is mainly for profiling.')),
+    (('--dtype', ),
+     dict(type=str,
+          default=EngineArgs.dtype,
+          choices=['auto', 'half', 'float16', 'bfloat16', 'float', 'float32'],
+          help='data type for model weights and activations. '
+          'The "auto" option will use FP16 precision '
+          'for FP32 and FP16 models, and BF16 precision '
+          'for BF16 models.')),
+    (('--max-model-len', ),
+     dict(type=int,
+          default=None,
+          help='model context length. If unspecified, '
+          'will be automatically derived from the model.')),
+    # Parallel arguments
+    (('--worker-use-ray', ),
+     dict(action='store_true',
+          help='use Ray for distributed serving, will be '
+          'automatically set when using more than 1 GPU')),
+    (('--pipeline-parallel-size', '-pp'),
+     dict(type=int,
+          default=EngineArgs.pipeline_parallel_size,
+          help='number of pipeline stages')),
+    (('--tensor-parallel-size', '-tp'),
+     dict(type=int,
+          default=EngineArgs.tensor_parallel_size,
+          help='number of tensor parallel replicas')),
+    # KV cache arguments
+    (('--block-size', ),
+     dict(type=int,
+          default=EngineArgs.block_size,
+          choices=[8, 16, 32, 64, 128, 256, 512, 1024],
+          help='token block size')),
+    # TODO(woosuk): Support fine-grained seeds (e.g., seed per request).
+    (('--seed', ), dict(type=int, default=EngineArgs.seed,
+                        help='random seed')),
+    (('--swap-space', ),
+     dict(type=int,
+          default=EngineArgs.swap_space,
+          help='CPU swap space size (GiB) per GPU')),
+    (('--gpu-memory-utilization', ),
+     dict(type=float,
+          default=EngineArgs.gpu_memory_utilization,
+          help='the percentage of GPU memory to be used for'
+          'the model executor')),
+    (('--max-num-batched-tokens', ),
+     dict(type=int,
+          default=EngineArgs.max_num_batched_tokens,
+          help='maximum number of batched tokens per '
+          'iteration')),
+    (('--max-num-seqs', ),
+     dict(type=int,
+          default=EngineArgs.max_num_seqs,
+          help='maximum number of sequences per iteration')),
+    (('--disable-log-stats', ),
+     dict(action='store_true', help='disable logging statistics')),
+    # Quantization settings.
+    (('--quantization', '-q'),
+     dict(type=str,
+          choices=['awq', 'squeezellm', None],
+          default=None,
+          help='Method used to quantize the weights')),
+    (('--load-s3-path', ),
+     dict(type=str, default=None, help='Fast loading s3 path')),
+    (('--load-s3-region', ),
+     dict(type=str, default='us-west-2', help='Fast loading s3 region')),
+    (('--rope-scaling', ),
+     dict(default=None, type=json.loads, help='RoPE scaling configuration')),
+    (('--speculative-model', ),
+     dict(type=str,
+          default=None,
+          help='name of the draft model to be used in speculative '
+          'decoding.')),
+    (('--speculative-model-uses-tp-1', ),
+     dict(action='store_true',
+          help='whether the speculative model should use the same tensor '
+          'parallel degree as the verifier model, or use tp=1')),
+    (('--num-speculative-tokens', ),
+     dict(type=int,
+          default=None,
+          help='number of speculative tokens to sample from '
+          'the draft model in speculative decoding')),
+    (('--target-model-input-padding-size', ),
+     dict(type=int,
+          default=None,
+          help='padding size for speculative decoding target'
+          ' model prompt/generation tokens.'
+          ' must be a multiple of 8')),
+    (('--draft-model-input-padding-size', ),
+     dict(type=int,
+          default=None,
+          help='padding size for speculative decoding draft'
+          ' model prompt/generation tokens.'
+          ' must be a multiple of 8')),
+    (('--flash-style', ), dict(action='store_true',
+                               help='use flash attention')),
+    (('--max-chunked-prefill-len', ),
+     dict(type=int,
+          default=-1,
+          help='max number of prefill tokens allowed in chunked prefill'
+          ', -1 means no limit')),
+    (('--max-num-prompt-seqs', ),
+     dict(type=int,
+          default=1024,
+          help='max number of prompt sequences allowed in prefill')),
+    (('--input-padding-size', ),
+     dict(type=int,
+          default=8,
+          help='padding size for prompt/generation tokens.'
+          ' must be a multiple of 8')),
+    (('--ray-workers-use-nsight', ),
+     dict(type=bool, default=False, help='use nsight to profile ray workers')),
+)
 
-@dataclass
+
+def _add_cli_args(
+    parser: argparse.ArgumentParser,
+    spec: _ArgSpec,
+) -> argparse.ArgumentParser:
+    for flags, kwargs in spec:
+        parser.add_argument(*flags, **kwargs)
+    return parser
+
+
+@dataclass(frozen=True)
 class AsyncEngineArgs(EngineArgs):
     """Arguments for asynchronous vLLM engine."""
     engine_use_ray: bool = False
@@ -404,18 +408,20 @@ class AsyncEngineArgs(EngineArgs):
     @staticmethod
     def add_cli_args(
             parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
-        parser = EngineArgs.add_cli_args(parser)
-        parser.add_argument('--engine-use-ray',
-                            action='store_true',
-                            help='use Ray to start the LLM engine in a '
-                            'separate process as the server process.')
-        parser.add_argument('--disable-log-requests',
-                            action='store_true',
-                            help='disable logging requests')
-        parser.add_argument('--max-log-len',
-                            type=int,
-                            default=None,
-                            help='max number of prompt characters or prompt '
-                            'ID numbers being printed in log. '
-                            'Default: unlimited.')
-        return parser
+        return _add_cli_args(parser, _ASYNC_ENGINE_ARGS_SPEC)
+
+
+_ASYNC_ENGINE_ARGS_SPEC: _ArgSpec = _ENGINE_ARGS_SPEC + (
+    (('--engine-use-ray', ),
+     dict(action='store_true',
+          help='use Ray to start the LLM engine in a '
+          'separate process as the server process.')),
+    (('--disable-log-requests', ),
+     dict(action='store_true', help='disable logging requests')),
+    (('--max-log-len', ),
+     dict(type=int,
+          default=None,
+          help='max number of prompt characters or prompt '
+          'ID numbers being printed in log. '
+          'Default: unlimited.')),
+)
@@ -1,8 +1,9 @@
 import asyncio
 import time
+from collections import deque
 from functools import partial
-from typing import (Any, Dict, Iterable, List, Optional, Set, Tuple, Type,
-                    Union)
+from typing import (Any, Deque, Dict, Iterable, List, Optional, Set, Tuple,
+                    Type, Union)
 
 from vllm.anyscale.lora.utils import LoRARequest
 from vllm.config import ModelConfig
@@ -78,16 +79,21 @@ class RequestTracker:
 
     def __init__(self) -> None:
         self._request_streams: Dict[str, AsyncStream] = {}
-        self._finished_requests: asyncio.Queue[str] = asyncio.Queue()
-        self._new_requests: asyncio.Queue[Tuple[AsyncStream,
-                                                dict]] = asyncio.Queue()
+        # New and finished requests in arrival order. A finished request is
+        # recorded as (request_id, None).
+        self._events: Deque[Tuple[str, Optional[Tuple[AsyncStream,
+                                                      dict]]]] = deque()
         self.new_requests_event = None
+        # Whether new_requests_event has been set since the last drain, so
+        # that a burst of new requests only wakes up the loop once.
+        self._has_pending = False
 
     def __contains__(self, item):
         return item in self._request_streams
 
     def init_event(self):
         self.new_requests_event = asyncio.Event()
+        self._has_pending = False
 
     def propagate_exception(self,
                             exc: Exception,
@@ -121,12 +127,14 @@ class RequestTracker:
             raise KeyError(f"Request {request_id} already exists.")
 
         stream = AsyncStream(request_id)
-        self._new_requests.put_nowait((stream, {
+        self._events.append((request_id, (stream, {
             "request_id": request_id,
             **engine_add_request_kwargs
-        }))
+        })))
 
-        self.new_requests_event.set()
+        if not self._has_pending:
+            self._has_pending = True
+            self.new_requests_event.set()
 
         return stream
 
@@ -135,7 +143,7 @@ class RequestTracker:
         if verbose:
             logger.info(f"Aborted request {request_id}.")
 
-        self._finished_requests.put_nowait(request_id)
+        self._events.append((request_id, None))
 
         if request_id not in self._request_streams or self._request_streams[
                 request_id].finished:
@@ -147,26 +155,33 @@ class RequestTracker:
     def get_new_and_finished_requests(self) -> Tuple[List[Dict], Set[str]]:
         """Get the new requests and finished requests to be
         sent to the engine."""
-        new_requests: List[Dict] = []
+        new_requests: Dict[str, Tuple[AsyncStream, Dict]] = {}
         finished_requests: Set[str] = set()
 
-        while not self._finished_requests.empty():
-            request_id = self._finished_requests.get_nowait()
+        events = self._events
+        while events:
+            request_id, new_request = events.popleft()
+            if new_request is not None:
+                if request_id in finished_requests:
+                    # The request has already been aborted.
+                    new_request[0].finish()
+                else:
+                    new_requests[request_id] = new_request
+                continue
             finished_requests.add(request_id)
             self._request_streams.pop(request_id, None)
+            aborted = new_requests.pop(request_id, None)
+            if aborted is not None:
+                # The request was aborted before reaching the engine.
+                aborted[0].finish()
 
-        while not self._new_requests.empty():
-            stream, new_request = self._new_requests.get_nowait()
-            if stream.request_id in finished_requests:
-                # The request has already been aborted.
-                stream.finish()
-                continue
-            self._request_streams[stream.request_id] = stream
-            new_requests.append(new_request)
+        for request_id, (stream, _) in new_requests.items():
+            self._request_streams[request_id] = stream
 
+        self._has_pending = False
         self.new_requests_event.clear()
 
-        return new_requests, finished_requests
+        return [r for _, r in new_requests.values()], finished_requests
 
     async def wait_for_new_requests(self):
         await self.new_requests_event.wait()
@@ -51,7 +51,7 @@ class SamplingTokenTensors:
         penalties_seq_lens: List[int],
         sample_indices: List[int],
         prompt_indices: List[int],
-        categorized_sample_indices: Dict[SamplingType, List[int]],
+        categorized_sample_indices: Dict[int, List[int]],
         device: torch.device,
         vocab_size: int  # pylint: disable=unused-argument
     ) -> "SamplingTokenTensors":
@@ -126,8 +126,7 @@ class SamplingTokenTensors:
         penalties_seq_lens: List[int] = []
         sample_indices: List[int] = []
         prompt_indices: List[int] = []
-        categorized_sample_indices: Dict[SamplingType,
-                                         List[int]] = defaultdict(list)
+        categorized_sample_indices: Dict[int, List[int]] = defaultdict(list)
 
         sample_indices_start_idx = 0
         categorized_indices_start_idx = 0
@@ -3,7 +3,7 @@ from typing import Dict, List, Tuple
 
 import torch
 
-from vllm.sampling_params import SamplingParams, SamplingType
+from vllm.sampling_params import SamplingParams
 from vllm.sequence import SequenceData
 from vllm.utils import in_wsl
 
@@ -27,7 +27,7 @@ class SamplingMetadata:
         seq_data: Dict[int, SequenceData],
         prompt_lens: List[int],
         selected_token_indices: torch.Tensor,
-        categorized_sample_indices: Dict[SamplingType, torch.Tensor],
+        categorized_sample_indices: Dict[int, torch.Tensor],
     ) -> None:
         self.seq_groups = seq_groups
         self.seq_data = seq_data
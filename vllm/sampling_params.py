@@ -1,17 +1,22 @@
 """Sampling parameters for text generation."""
-from enum import IntEnum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Final, List, Optional, Tuple, Union
 import torch
 
 import msgspec
 
 _SAMPLING_EPS = 1e-5
 
+_force_setattr = msgspec.structs.force_setattr
 
-class SamplingType(IntEnum):
-    GREEDY = 0
-    RANDOM = 1
-    BEAM = 2
+
+class SamplingType:
+    """Sampling methods. These are plain ints rather than an IntEnum since
+    they are read and used as dict keys for every sequence on every step."""
+    GREEDY: Final[int] = 0
+    RANDOM: Final[int] = 1
+    BEAM: Final[int] = 2
+
+    ALL: Final[Tuple[int, ...]] = (GREEDY, RANDOM, BEAM)
 
 
 LogitsProcessor = Callable[[List[int], torch.Tensor], torch.Tensor]
@@ -20,7 +25,11 @@ tokens and a tensor of the logits for the next token, and returns a modified
 tensor of logits to sample from."""
 
 
-class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
+class SamplingParams(msgspec.Struct,
+                     array_like=True,
+                     omit_defaults=True,
+                     frozen=True,
+                     dict=True):
     """Sampling parameters for text generation.
 
     Overall, we follow the sampling parameters from the OpenAI text completion
@@ -66,11 +75,12 @@ class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
             unlikely to find better candidates; `"never"`, where the beam search
             procedure only stops when there cannot be better candidates
             (canonical beam search algorithm).
-        stop: List of strings that stop the generation when they are generated.
-            The returned output will not contain the stop strings.
-        stop_token_ids: List of tokens that stop the generation when they are
+        stop: Strings that stop the generation when they are generated.
+            The returned output will not contain the stop strings. A single
+            string or a list is accepted and stored as a tuple.
+        stop_token_ids: Tokens that stop the generation when they are
             generated. The returned output will contain the stop tokens unless
-            the stop tokens are sepcial tokens.
+            the stop tokens are sepcial tokens. Stored as a tuple.
         ignore_eos: Whether to ignore the EOS token and continue generating
             tokens after the EOS token is generated.
         max_tokens: Maximum number of tokens to generate per output sequence.
@@ -89,6 +99,10 @@ class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
         response_format: Format to return the final response in. Can be for ex:
             response_format={"type": "json", "schema": "{...}"}
 
+    SamplingParams is immutable; use `msgspec.structs.replace` to derive a
+    modified copy. It is hashable only while `logits_processors` and
+    `response_format` are None, since lists and dicts cannot be hashed.
+
     """
 
     n: int = 1
@@ -103,8 +117,8 @@ class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
     use_beam_search: bool = False
     length_penalty: float = 1.0
     early_stopping: Union[bool, str] = False
-    stop: List[str] = []
-    stop_token_ids: List[int] = []
+    stop: Tuple[str, ...] = ()
+    stop_token_ids: Tuple[int, ...] = ()
     ignore_eos: bool = False
     max_tokens: int = 16
     logprobs: Optional[int] = None
@@ -114,43 +128,75 @@ class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
     logits_processors: Optional[List[LogitsProcessor]] = None
     response_format: Optional[Dict[str, Any]] = None
 
+    # _actual_best_of, _has_penalties and _sampling_type are derived from the
+    # fields above in __post_init__. They are instance attributes rather than
+    # struct fields (dict=True) so they are not encoded, compared or hashed;
+    # msgspec runs __post_init__ again on decode. msgspec's __copy__ does not
+    # copy __dict__, so __copy__ returns self, which is safe for a frozen
+    # struct.
+
     @property
     def actual_best_of(self) -> int:
-        return (self.best_of if
-                (self.best_of is not None and self.best_of > 0) else self.n)
+        return self._actual_best_of
 
     @property
     def has_penalties(self) -> bool:
-        return (abs(self.presence_penalty) >= _SAMPLING_EPS
-                or abs(self.frequency_penalty) >= _SAMPLING_EPS
-                or abs(self.repetition_penalty - 1.0) >= _SAMPLING_EPS)
+        return self._has_penalties
 
     @property
-    def sampling_type(self) -> SamplingType:
-        if self.use_beam_search:
-            return SamplingType.BEAM
-        if self.temperature < _SAMPLING_EPS:
-            return SamplingType.GREEDY
-        return SamplingType.RANDOM
+    def sampling_type(self) -> int:
+        return self._sampling_type
+
+    def __copy__(self) -> "SamplingParams":
+        return self
 
     def __post_init__(self):
         assert not self.use_beam_search, "beam search is disabled"
-        self._verify_args()
+        # best_of defaults to 0; None and 0 both mean "same as n".
+        actual_best_of = self.best_of or self.n
+        # The struct is frozen, so fields are normalized with force_setattr.
+        # The defaults are shared empty tuples; only normalize user input.
+        if not isinstance(self.stop, tuple):
+            if self.stop is None:
+                stop = ()
+            elif isinstance(self.stop, str):
+                stop = (self.stop, )
+            else:
+                stop = tuple(self.stop)
+            _force_setattr(self, "stop", stop)
+        if not isinstance(self.stop_token_ids, tuple):
+            stop_token_ids = (() if self.stop_token_ids is None else tuple(
+                self.stop_token_ids))
+            _force_setattr(self, "stop_token_ids", stop_token_ids)
         # if self.use_beam_search:
         #     self._verify_beam_search()
         # else:
-        self._verify_non_beam_search()
-        if self.temperature < _SAMPLING_EPS:
-            # Zero temperature means greedy sampling.
-            self._verify_greedy_sampling()
+        self._verify_args(actual_best_of)
 
-    def _verify_args(self) -> None:
+        if self.use_beam_search:
+            sampling_type = SamplingType.BEAM
+        elif self.temperature < _SAMPLING_EPS:
+            sampling_type = SamplingType.GREEDY
+        else:
+            sampling_type = SamplingType.RANDOM
+        # Write the derived values into the instance __dict__ directly; this
+        # is cheaper than one force_setattr call per attribute.
+        d = self.__dict__
+        d["_actual_best_of"] = actual_best_of
+        d["_has_penalties"] = (
+            abs(self.presence_penalty) >= _SAMPLING_EPS
+            or abs(self.frequency_penalty) >= _SAMPLING_EPS
+            or abs(self.repetition_penalty - 1.0) >= _SAMPLING_EPS)
+        d["_sampling_type"] = sampling_type
+
+    def _verify_args(self, actual_best_of: int) -> None:
+        """Validate all arguments in a single pass. This runs for every
+        request, so error messages are only formatted on failure."""
         if self.n < 1:
             raise ValueError(f"n must be at least 1, got {self.n}.")
-        if self.actual_best_of < self.n:
-            raise ValueError(
-                f"best_of must be greater than or equal to n, "
-                f"got n={self.n} and best_of={self.actual_best_of}.")
+        if actual_best_of < self.n:
+            raise ValueError(f"best_of must be greater than or equal to n, "
+                             f"got n={self.n} and best_of={actual_best_of}.")
         if not -2.0 <= self.presence_penalty <= 2.0:
             raise ValueError("presence_penalty must be in [-2, 2], got "
                              f"{self.presence_penalty}.")
@@ -181,6 +227,29 @@ class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
             raise ValueError(f"prompt_logprobs must be non-negative, got "
                              f"{self.prompt_logprobs}.")
 
+        # Beam search is disabled, so the beam search only arguments must
+        # keep their defaults.
+        if self.early_stopping is not False:
+            raise ValueError("early_stopping is not effective and must be "
+                             "False when not using beam search.")
+        if (self.length_penalty < 1.0 - _SAMPLING_EPS
+                or self.length_penalty > 1.0 + _SAMPLING_EPS):
+            raise ValueError(
+                "length_penalty is not effective and must be the "
+                "default value of 1.0 when not using beam search.")
+
+        if self.temperature < _SAMPLING_EPS:
+            # Zero temperature means greedy sampling.
+            if actual_best_of > 1:
+                raise ValueError(
+                    "best_of must be 1 when using greedy sampling."
+                    f"Got {actual_best_of}.")
+            if self.top_p < 1.0 - _SAMPLING_EPS:
+                raise ValueError("top_p must be 1 when using greedy sampling.")
+            if self.top_k != -1:
+                raise ValueError(
+                    "top_k must be -1 when using greedy sampling.")
+
     # def _verify_beam_search(self) -> None:
     #     if self.actual_best_of == 1:
     #         raise ValueError("best_of must be greater than 1 when using beam "
@@ -196,28 +265,9 @@ class SamplingParams(msgspec.Struct, array_like=True, omit_defaults=True):
     #             f"early_stopping must be True, False, or 'never', "
     #             f"got {self.early_stopping}.")
 
-    def _verify_non_beam_search(self) -> None:
-        if self.early_stopping is not False:
-            raise ValueError("early_stopping is not effective and must be "
-                             "False when not using beam search.")
-        if (self.length_penalty < 1.0 - _SAMPLING_EPS
-                or self.length_penalty > 1.0 + _SAMPLING_EPS):
-            raise ValueError(
-                "length_penalty is not effective and must be the "
-                "default value of 1.0 when not using beam search.")
-
-    def _verify_greedy_sampling(self) -> None:
-        if self.actual_best_of > 1:
-            raise ValueError("best_of must be 1 when using greedy sampling."
-                             f"Got {self.actual_best_of}.")
-        if self.top_p < 1.0 - _SAMPLING_EPS:
-            raise ValueError("top_p must be 1 when using greedy sampling.")
-        if self.top_k != -1:
-            raise ValueError("top_k must be -1 when using greedy sampling.")
-
     def __repr__(self) -> str:
         return (f"SamplingParams(n={self.n}, "
-                f"best_of={self.actual_best_of}, "
+                f"best_of={self._actual_best_of}, "
                 f"presence_penalty={self.presence_penalty}, "
                 f"frequency_penalty={self.frequency_penalty}, "
                 f"repetition_penalty={self.repetition_penalty}, "
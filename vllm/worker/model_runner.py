@@ -256,7 +256,7 @@ class ModelRunner:
         seq_groups: List[Tuple[List[int], SamplingParams]] = []
         selected_token_indices: List[int] = []
         selected_token_start_idx = 0
-        categorized_sample_indices = {t: [] for t in SamplingType}
+        categorized_sample_indices = {t: [] for t in SamplingType.ALL}
         categorized_sample_indices_start_idx = 0
 
         max_prompt_len = max(prompt_lens) if prompt_lens else 1